@@ -0,0 +1,152 @@
+"""Batch solver for bulk offline workloads.
+
+Reads newline-delimited cubes and writes one JSON result per line (NDJSON),
+solving across a process pool. Each input line is one of:
+
+    UUUUUUUUURRRRRRRRRFFFFFFFFFDDDDDDDDDLLLLLLLLLBBBBBBBBB
+    {"U": [...], "R": [...], "F": [...], "D": [...], "L": [...], "B": [...]}
+    {"id": "scan-42", "cube_faces": {"U": [...], ...}}
+    {"id": "scan-43", "cube_string": "UUUUUUUUU..."}
+
+Results are emitted in input order. Each carries `index`, the 0-based
+position of the cube in the input, plus the caller's `id` when one was given.
+
+    python BatchSolve.py scans.txt --workers 8 > solutions.ndjson
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from SolutionIndex import FACE_ORDER
+from Solver import cube_faces_to_string, solve_cube_string
+
+DEFAULT_CHUNKSIZE = 16
+
+
+def parse_line(line):
+    """Return (id, cube) for one input line; cube is a cube string or a face dict"""
+    line = line.strip()
+    if not line.startswith('{'):
+        return None, line
+    entry = json.loads(line)
+    if 'cube_string' in entry:
+        return entry.get('id'), entry['cube_string']
+    return entry.get('id'), entry.get('cube_faces', entry)
+
+
+def solve_entry(task):
+    """Solve one numbered input line; runs inside the worker processes"""
+    position, line = task
+    result = {'index': position}
+    try:
+        given_id, cube = parse_line(line)
+        if given_id is not None:
+            result['id'] = given_id
+        if isinstance(cube, dict):
+            if not all(face in cube for face in FACE_ORDER):
+                raise ValueError('All 6 faces must be scanned')
+            cube = cube_faces_to_string(cube)
+        result.update(solve_cube_string(cube))
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def solve_chunk(tasks):
+    """Solve a list of numbered input lines in one worker round trip"""
+    return [solve_entry(task) for task in tasks]
+
+
+def iter_chunks(lines, chunksize):
+    """Group non-blank lines into lists of (position, line) tasks"""
+    chunk = []
+    for task in enumerate(line for line in lines if line.strip()):
+        chunk.append(task)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_batch(pool, lines, chunksize=DEFAULT_CHUNKSIZE, in_flight=1):
+    """Solve lines on `pool`, yielding results in input order with at most `in_flight` chunks queued"""
+    pending = deque()
+    try:
+        for chunk in iter_chunks(lines, chunksize):
+            if len(pending) >= in_flight:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(solve_chunk, chunk))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # Consumer stopped early (e.g. client disconnected): drop queued chunks
+        for future in pending:
+            future.cancel()
+
+
+def _batch_workers():
+    """Web pool size: BATCH_WORKERS, capped at this gunicorn worker's share of the CPUs"""
+    cpus = os.cpu_count() or 1
+    try:
+        web_workers = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+        workers = int(os.environ.get('BATCH_WORKERS', cpus))
+    except ValueError as e:
+        print(f"⚠️  Ignoring invalid BATCH_WORKERS/WEB_CONCURRENCY: {e}")
+        web_workers, workers = 1, cpus
+    return max(1, min(workers, cpus // web_workers))
+
+
+BATCH_WORKERS = _batch_workers()
+
+_shared_pool = None
+
+
+def shared_pool():
+    """Process pool shared by every web request in this process, rebuilt if a worker died"""
+    global _shared_pool
+    if _shared_pool is not None and getattr(_shared_pool, '_broken', False):
+        _shared_pool.shutdown(wait=False, cancel_futures=True)
+        _shared_pool = None
+    if _shared_pool is None:
+        _shared_pool = ProcessPoolExecutor(max_workers=BATCH_WORKERS)
+    return _shared_pool
+
+
+def solve_batch(lines, workers=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Solve newline-delimited cubes on a private pool, yielding results in input order"""
+    workers = workers or os.cpu_count()
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from iter_batch(pool, lines, chunksize, in_flight=2 * workers)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many cubes, writing NDJSON results")
+    parser.add_argument('input', nargs='?', help="input file (default: stdin)")
+    parser.add_argument('--workers', type=positive_int, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=positive_int, default=DEFAULT_CHUNKSIZE,
+                        help="cubes sent to a worker at a time")
+    args = parser.parse_args()
+
+    source = open(args.input) if args.input else sys.stdin
+    with source:
+        for result in solve_batch(source, args.workers, args.chunksize):
+            sys.stdout.write(json.dumps(result) + '\n')
+            sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
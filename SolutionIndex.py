@@ -0,0 +1,317 @@
+"""Precomputed solution index for near-solved states and known patterns.
+
+The index is a single binary file built offline and memory-mapped by the web
+server, so `/api/solve` can answer common states without calling kociemba.
+
+Build it with:
+
+    python SolutionIndex.py --depth 4 --out data/solutions.idx
+
+File layout (little endian):
+
+    header  : magic (8s), slot count (I), entry count (I), depth (I)
+    slots   : slot count x [cube key (18s), blob offset (I)]
+    blob    : per entry [move count (B), move codes (B each)]
+
+Cube keys are the 54-character facelet string read as a base-6 number, and
+slots are filled by linear probing from a blake2b hash of that key.
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+
+MAGIC = b'RCVIDX01'
+HEADER = struct.Struct('<8sIII')
+SLOT = struct.Struct('<18sI')
+EMPTY = 0xFFFFFFFF
+LOAD_FACTOR = 0.5
+
+DEFAULT_PATH = os.path.join('data', 'solutions.idx')
+DEFAULT_DEPTH = 4
+
+FACE_ORDER = 'URFDLB'
+SOLVED = ''.join(face * 9 for face in FACE_ORDER)
+MOVES = [face + suffix for face in FACE_ORDER for suffix in ('', '2', "'")]
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+
+# Curated patterns, given as the moves that produce them from solved
+PATTERNS = {
+    'checkerboard': "U2 D2 F2 B2 L2 R2",
+    'superflip': "U R2 F B R B2 R U2 L B2 R U' D' R2 F R' L B2 U2 F2",
+    'cube in cube': "F L F U' R U F2 L2 U' L' B D' B' L2 U",
+    'cube in cube in cube': "U' L' U' F' R2 B' R F U B2 U B' L U' F U R F'",
+    'six spots': "U D' R L' F B' U D'",
+    'four spots': "F2 B2 U D' R2 L2 U D'",
+    'cross': "R2 L' D F2 R' D' R' L U' D R D B2 R' U D2",
+    'wire': "R L F B R L F B R L F B R2 B2 L2 R2 B2 L2",
+    'vertical stripes': "F U F R L2 B D' R D2 L D' B R2 L F U F",
+    'plus minus': "U2 R2 L2 U2 R2 L2",
+}
+
+
+def _facelet_positions():
+    """Map each facelet index to its (cubie position, outward normal)"""
+    positions = []
+    for face in FACE_ORDER:
+        for i in range(9):
+            r, c = divmod(i, 3)
+            if face == 'U':
+                positions.append(((c - 1, 1, r - 1), (0, 1, 0)))
+            elif face == 'R':
+                positions.append(((1, 1 - r, 1 - c), (1, 0, 0)))
+            elif face == 'F':
+                positions.append(((c - 1, 1 - r, 1), (0, 0, 1)))
+            elif face == 'D':
+                positions.append(((c - 1, -1, 1 - r), (0, -1, 0)))
+            elif face == 'L':
+                positions.append(((-1, 1 - r, c - 1), (-1, 0, 0)))
+            elif face == 'B':
+                positions.append(((1 - c, 1 - r, -1), (0, 0, -1)))
+    return positions
+
+
+def _rotate(vector, axis, sign):
+    """Rotate a vector a quarter turn clockwise around axis `sign * axis`"""
+    x, y, z = vector
+    if axis == 0:
+        return (x, z, -y) if sign > 0 else (x, -z, y)
+    if axis == 1:
+        return (-z, y, x) if sign > 0 else (z, y, -x)
+    return (y, -x, z) if sign > 0 else (-y, x, z)
+
+
+def _build_permutations():
+    """Facelet permutations for every move, as `new[i] = old[perm[i]]`"""
+    positions = _facelet_positions()
+    index = {pos: i for i, pos in enumerate(positions)}
+    axes = {'U': (1, 1), 'D': (1, -1), 'R': (0, 1), 'L': (0, -1), 'F': (2, 1), 'B': (2, -1)}
+    quarter = {}
+    for face, (axis, sign) in axes.items():
+        perm = list(range(54))
+        for i, (cubie, normal) in enumerate(positions):
+            if cubie[axis] == sign:
+                target = index[(_rotate(cubie, axis, sign), _rotate(normal, axis, sign))]
+                perm[target] = i
+        quarter[face] = perm
+    perms = {}
+    for face, perm in quarter.items():
+        double = [perm[j] for j in perm]
+        perms[face] = perm
+        perms[face + '2'] = double
+        perms[face + "'"] = [double[j] for j in perm]
+    return perms
+
+
+PERMUTATIONS = _build_permutations()
+
+
+def apply_moves(cube_string, moves):
+    """Apply a move sequence (list or space separated string) to a cube string"""
+    if isinstance(moves, str):
+        moves = moves.split()
+    for move in moves:
+        perm = PERMUTATIONS[move]
+        cube_string = ''.join([cube_string[j] for j in perm])
+    return cube_string
+
+
+def invert_moves(moves):
+    """Return the move sequence that undoes `moves`"""
+    if isinstance(moves, str):
+        moves = moves.split()
+    inverted = []
+    for move in reversed(moves):
+        if move.endswith("'"):
+            inverted.append(move[0])
+        elif move.endswith('2'):
+            inverted.append(move)
+        else:
+            inverted.append(move + "'")
+    return inverted
+
+
+def encode_key(cube_string):
+    """Pack a 54-character facelet string into 18 bytes"""
+    value = 0
+    for facelet in cube_string:
+        value = value * 6 + FACE_ORDER.index(facelet)
+    return value.to_bytes(18, 'little')
+
+
+def _slot_for(key, slot_count):
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % slot_count
+
+
+def enumerate_near_solved(depth):
+    """Breadth-first search from solved; returns {cube string: optimal solution}"""
+    solutions = {SOLVED: []}
+    frontier = [(SOLVED, [])]
+    for _ in range(depth):
+        next_frontier = []
+        for state, path in frontier:
+            last_face = path[-1][0] if path else None
+            for move in MOVES:
+                if move[0] == last_face:
+                    continue
+                new_state = apply_moves(state, [move])
+                if new_state in solutions:
+                    continue
+                new_path = path + [move]
+                solutions[new_state] = invert_moves(new_path)
+                next_frontier.append((new_state, new_path))
+        frontier = next_frontier
+    return solutions
+
+
+def pattern_solutions(scrambles, solver=None):
+    """Solutions for pattern or scramble move sequences, preferring the solver's answer when shorter"""
+    solutions = {}
+    for scramble in scrambles:
+        state = apply_moves(SOLVED, scramble)
+        best = invert_moves(scramble)
+        if solver is not None:
+            candidate = solver(state).split()
+            if len(candidate) < len(best):
+                best = candidate
+        if state not in solutions or len(best) < len(solutions[state]):
+            solutions[state] = best
+    return solutions
+
+
+def read_scrambles(path):
+    """Read one scramble per line, raising ValueError naming the file line on unknown moves"""
+    scrambles = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            for move in line.split():
+                if move not in PERMUTATIONS:
+                    raise ValueError(f"{path}:{line_no}: unknown move {move!r}")
+            scrambles.append(line)
+    return scrambles
+
+
+def write_index(solutions, path, depth):
+    """Write a {cube string: move list} mapping to an index file"""
+    slot_count = max(1, int(len(solutions) / LOAD_FACTOR) + 1)
+    slots = [None] * slot_count
+    blob = bytearray()
+    for cube_string, moves in solutions.items():
+        key = encode_key(cube_string)
+        offset = len(blob)
+        blob.append(len(moves))
+        blob.extend(MOVE_CODES[move] for move in moves)
+        slot = _slot_for(key, slot_count)
+        while slots[slot] is not None:
+            slot = (slot + 1) % slot_count
+        slots[slot] = (key, offset)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file first so an interrupted build never leaves a partial index
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, slot_count, len(solutions), depth))
+        for entry in slots:
+            f.write(SLOT.pack(*entry) if entry is not None else SLOT.pack(b'\0' * 18, EMPTY))
+        f.write(blob)
+    os.replace(temp_path, path)
+
+
+class SolutionIndex:
+    """Read-only view of an index file, backed by mmap"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.slot_count, self.entry_count, self.depth = HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"Not a solution index: {path}")
+            self._blob_start = HEADER.size + self.slot_count * SLOT.size
+            if self.slot_count == 0 or len(self._map) < self._blob_start:
+                raise ValueError(f"Truncated solution index: {path}")
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+
+    def __len__(self):
+        return self.entry_count
+
+    def lookup(self, cube_string):
+        """Return the stored solution string, or None if the state is not indexed"""
+        if len(cube_string) != 54 or any(c not in FACE_ORDER for c in cube_string):
+            return None
+        key = encode_key(cube_string)
+        slot = _slot_for(key, self.slot_count)
+        for _ in range(self.slot_count):
+            stored_key, offset = SLOT.unpack_from(self._map, HEADER.size + slot * SLOT.size)
+            if offset == EMPTY:
+                return None
+            if stored_key == key:
+                start = self._blob_start + offset
+                if start >= len(self._map):
+                    return None
+                count = self._map[start]
+                codes = self._map[start + 1:start + 1 + count]
+                if len(codes) != count or any(code >= len(MOVES) for code in codes):
+                    return None
+                return ' '.join(MOVES[code] for code in codes)
+            slot = (slot + 1) % self.slot_count
+        return None
+
+    def close(self):
+        self._map.close()
+
+
+def load(path=DEFAULT_PATH):
+    """Open the index at `path`, or return None if it is missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return SolutionIndex(path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"⚠️  Ignoring solution index {path}: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the precomputed solution index")
+    parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH,
+                        help="index every state within this many moves of solved")
+    parser.add_argument('--scrambles', help="file with extra scrambles, one per line")
+    parser.add_argument('--no-solver', action='store_true',
+                        help="use inverted patterns instead of asking kociemba for shorter solutions")
+    parser.add_argument('--out', default=DEFAULT_PATH, help="output index file")
+    args = parser.parse_args()
+
+    solver = None
+    if not args.no_solver:
+        import kociemba
+        solver = kociemba.solve
+
+    scrambles = list(PATTERNS.values())
+    if args.scrambles:
+        try:
+            scrambles.extend(read_scrambles(args.scrambles))
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+
+    print(f"🧩 Solving {len(scrambles)} patterns and scrambles...")
+    solutions = pattern_solutions(scrambles, solver)
+    print(f"🔍 Enumerating states within {args.depth} moves of solved...")
+    # Near-solved solutions are optimal, so they win over pattern solutions
+    solutions.update(enumerate_near_solved(args.depth))
+
+    write_index(solutions, args.out, args.depth)
+    print(f"✅ Wrote {len(solutions)} states to {args.out} ({os.path.getsize(args.out)} bytes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Shared cube solving used by the web server and the batch solver."""
+import os
+
+import kociemba
+
+import SolutionIndex
+from SolutionIndex import FACE_ORDER
+
+# Precomputed solutions, built offline with `python SolutionIndex.py`
+solution_index = SolutionIndex.load(os.environ.get('SOLUTION_INDEX', SolutionIndex.DEFAULT_PATH))
+
+
+def cube_faces_to_string(cube_faces):
+    """Build the kociemba cube string from scanned faces, using centers as face colors"""
+    color_to_face = {cube_faces[face][4]: face for face in FACE_ORDER}
+    return ''.join(color_to_face.get(color, '?') for face in FACE_ORDER for color in cube_faces[face])
+
+
+def expand_moves(moves):
+    """Expand moves for the guide (handle B moves and double moves)"""
+    expanded_moves = []
+    for move in moves:
+        if move == "B":
+            expanded_moves.extend(["TURN_BACK", "F", "TURN_BACK"])
+        elif move == "B'":
+            expanded_moves.extend(["TURN_BACK", "F'", "TURN_BACK"])
+        elif move == "B2":
+            expanded_moves.extend(["TURN_BACK", "F", "F", "TURN_BACK"])
+        elif move.endswith("2"):
+            expanded_moves.extend([move[0], move[0]])
+        else:
+            expanded_moves.append(move)
+    return expanded_moves
+
+
+def solve_cube_string(cube_string):
+    """Solve a cube string and return the `/api/solve` response fields"""
+    # Check the precomputed index before running the solver
+    solution = solution_index.lookup(cube_string) if solution_index else None
+    source = 'index'
+    if solution is None:
+        solution = kociemba.solve(cube_string)
+        source = 'solver'
+    moves = solution.strip().split()
+    return {
+        'solution': solution,
+        'moves': moves,
+        'expanded_moves': expand_moves(moves),
+        'cube_string': cube_string,
+        'source': source
+    }
@@ -1,15 +1,22 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 import cv2
 import numpy as np
 import base64
 import copy
-import kociemba
+import json
 import os
+from contextlib import closing
+from BatchSolve import BATCH_WORKERS, iter_batch, shared_pool
+from Solver import cube_faces_to_string, solve_cube_string
 
 app = Flask(__name__, static_folder='static', static_url_path='')
 CORS(app)
 
+# Limits for one /api/solve-batch request
+MAX_BATCH_BYTES = 4 * 1024 * 1024
+MAX_BATCH_LINES = 10000
+
 def classify_hue(h, s, v):
     """Classify color based on HSV values - optimized for bright colors"""
     # White: Low saturation, high value
@@ -205,36 +212,38 @@ def solve():
         if not cube_faces or len(cube_faces) != 6:
             return jsonify({'error': 'All 6 faces must be scanned'}), 400
         
-        face_order = ['U', 'R', 'F', 'D', 'L', 'B']
-        
-        # Build cube string
-        color_to_face = {cube_faces[face][4]: face for face in face_order}
-        cube_string = ''.join(color_to_face.get(color, '?') for face in face_order for color in cube_faces[face])
-        
-        # Solve using kociemba
-        solution = kociemba.solve(cube_string)
-        moves = solution.strip().split()
+        cube_string = cube_faces_to_string(cube_faces)
+        return jsonify(solve_cube_string(cube_string))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def stream_results(results):
+    """NDJSON lines for a batch; closing the stream cancels unsolved chunks"""
+    with closing(results):
+        try:
+            for result in results:
+                yield json.dumps(result) + '\n'
+        except Exception as e:
+            # Headers are already sent, so report failures as a final record
+            yield json.dumps({'error': str(e)}) + '\n'
+
+@app.route('/api/solve-batch', methods=['POST'])
+def solve_batch_endpoint():
+    """Solve newline-delimited cubes, streaming NDJSON results in input order"""
+    try:
+        body = request.stream.read(MAX_BATCH_BYTES + 1)
+        if len(body) > MAX_BATCH_BYTES:
+            return jsonify({'error': f'Batch body is larger than {MAX_BATCH_BYTES} bytes'}), 413
         
-        # Expand moves (handle B moves and double moves)
-        expanded_moves = []
-        for move in moves:
-            if move == "B":
-                expanded_moves.extend(["TURN_BACK", "F", "TURN_BACK"])
-            elif move == "B'":
-                expanded_moves.extend(["TURN_BACK", "F'", "TURN_BACK"])
-            elif move == "B2":
-                expanded_moves.extend(["TURN_BACK", "F", "F", "TURN_BACK"])
-            elif move.endswith("2"):
-                expanded_moves.extend([move[0], move[0]])
-            else:
-                expanded_moves.append(move)
+        lines = [line for line in body.decode('utf-8').splitlines() if line.strip()]
+        if not lines:
+            return jsonify({'error': 'No cubes given'}), 400
+        if len(lines) > MAX_BATCH_LINES:
+            return jsonify({'error': f'Batch has more than {MAX_BATCH_LINES} cubes'}), 413
         
-        return jsonify({
-            'solution': solution,
-            'moves': moves,
-            'expanded_moves': expanded_moves,
-            'cube_string': cube_string
-        })
+        # Keep only a few chunks per request queued so concurrent batches share the pool fairly
+        results = iter_batch(shared_pool(), lines, in_flight=BATCH_WORKERS)
+        return Response(stream_results(results), mimetype='application/x-ndjson')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
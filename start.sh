@@ -19,6 +19,12 @@ source venv/bin/activate
 echo "📥 Installing dependencies..."
 pip install -r requirements.txt
 
+# Build the precomputed solution index (once)
+if [ ! -f "data/solutions.idx" ]; then
+    echo "🗂️  Building solution index..."
+    python SolutionIndex.py
+fi
+
 # Start the server
 echo ""
 echo "🚀 Starting Flask server..."